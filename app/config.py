@@ -1,33 +1,82 @@
 # encoding: utf-8
 
+import hashlib
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 import requests
 import yaml
 
 from app import logger
 from app.constants import (
+    CONFLICTING_SETTINGS,
     SETTINGS_PER_ACTION,
     SETTINGS_PER_INSTANCE,
     VALID_ACTION_MODES,
+    VALID_INSTANCE_TYPES,
     VALID_SORT_FIELDS,
     VALID_SORT_ORDERS,
+    VALID_WATCH_STATUSES,
 )
 from app.modules.tautulli import Tautulli
 from app.modules.trakt import Trakt
-from app.utils import validate_units
+from app.utils import create_session, validate_units
+
+# Prefer the libyaml-backed loader, fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Parsed configs keyed by absolute path, along with the (mtime, size) they were read at
+_CONFIG_CACHE = {}
+
+# Upper bound on connection probes running at the same time
+MAX_CONCURRENT_PROBES = 32
+
+# (connect, read) timeouts for connection probes
+PROBE_TIMEOUT = (3.05, 10)
+
+# Shared session so probes reuse pooled connections instead of reconnecting
+_SESSION = create_session(pool_maxsize=MAX_CONCURRENT_PROBES)
+
+# Endpoints that already answered a connection probe during this process
+_VERIFIED_CONNECTIONS = set()
+
+
+def connection_key(url, secret):
+    # Only keep a digest of the credentials around, never the secret itself
+    digest = hashlib.blake2b(str(secret).encode(), digest_size=8).hexdigest()
+    return (url, digest)
 
 
 def load_config(config_file):
     try:
         full_path = os.path.abspath(config_file)
-        with open(full_path, "r", encoding="utf8") as stream:
+        stat = os.stat(full_path)
+        file_id = (stat.st_mtime_ns, stat.st_size)
+
+        cached = _CONFIG_CACHE.get(full_path)
+        if cached and cached[0] == file_id:
+            return cached[1]
+
+        with open(full_path, "rb") as stream:
             logger.debug("Loading configuration from %s", full_path)
-            return Config(yaml.safe_load(stream))
+            data = stream.read()
+
+        # libyaml detects the encoding and BOM from the raw bytes itself
+        logger.debug("Using YAML loader %s", SafeLoader.__name__)
+        config = Config(yaml.load(data, Loader=SafeLoader))
+
+        _CONFIG_CACHE[full_path] = (file_id, config)
+        return config
     except FileNotFoundError:
         logger.error(
-            f"Configuration file {config_file} not found. Copy the example config and edit it to your needs."
+            "Configuration file %s not found. Copy the example config and edit it to your needs.",
+            config_file,
         )
     except yaml.YAMLError as exc:
         logger.error(exc)
@@ -35,10 +84,51 @@ def load_config(config_file):
     sys.exit(1)
 
 
+def clear_config_cache():
+    _CONFIG_CACHE.clear()
+
+
+def get_configured_names(settings, instance_type):
+    connections = (settings or {}).get(instance_type) or []
+    if not isinstance(connections, list):
+        return set()
+    # Malformed entries are reported by Config.validate_instance_settings
+    return {
+        connection.get("name")
+        for connection in connections
+        if isinstance(connection, dict)
+    }
+
+
 class Config:
+    __slots__ = ("_settings", "_configured_names", "_validation_cache")
+
+    # Checks that only inspect the settings, run before any connection probe
+    STRUCTURE_VALIDATORS = ("validate_instance_settings", "validate_libraries")
+
+    # Independent network probes, run concurrently
+    CONNECTION_VALIDATORS = (
+        "validate_trakt",
+        "validate_sonarr_and_radarr",
+        "validate_tautulli",
+    )
+
     def __init__(self, config_file):
         self.settings = config_file
 
+    @property
+    def settings(self):
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings):
+        self._settings = settings
+        self._configured_names = {
+            instance_type: get_configured_names(settings, instance_type)
+            for instance_type in VALID_INSTANCE_TYPES
+        }
+        self._validation_cache = {}
+
     def validate(self):
         if not self.validate_config():
             self.log_and_exit("Invalid configuration, exiting.")
@@ -56,26 +146,54 @@ class Config:
         sys.exit(1)
 
     def validate_config(self):
-        return (
-            self.validate_trakt()
-            and self.validate_sonarr_and_radarr()
-            and self.validate_tautulli()
-            and self.validate_libraries()
-        )
+        # Keyed on a digest of the settings so in-place edits are picked up too
+        key = hashlib.blake2b(repr(self.settings).encode(), digest_size=16).digest()
+        if key in self._validation_cache:
+            return self._validation_cache[key]
+
+        # Check the config structure first so broken configs fail before any I/O
+        if not all(self.run_validator(name) for name in self.STRUCTURE_VALIDATORS):
+            return False
+
+        # The connection checks are independent network probes, run them together
+        with ThreadPoolExecutor(
+            max_workers=len(self.CONNECTION_VALIDATORS)
+        ) as executor:
+            probes = [
+                executor.submit(self.run_validator, name)
+                for name in self.CONNECTION_VALIDATORS
+            ]
+            valid = all([probe.result() for probe in probes])
+
+        # Only successful runs are remembered, failures are retried
+        if valid:
+            self._validation_cache[key] = valid
+        return valid
+
+    def run_validator(self, name):
+        logger.debug("Running %s", name)
+        start = time.perf_counter()
+        result = getattr(self, name)()
+        logger.debug("%s finished in %.3fs", name, time.perf_counter() - start)
+        return result
 
     def validate_trakt(self):
-        if not self.settings.get("trakt"):
+        trakt_config = self.settings.get("trakt")
+        if not trakt_config:
+            return True
+        client_id = trakt_config.get("client_id")
+        client_secret = trakt_config.get("client_secret")
+        key = connection_key(client_id, client_secret)
+        if key in _VERIFIED_CONNECTIONS:
             return True
         try:
-            t = Trakt(
-                self.settings.get("trakt", {}).get("client_id"),
-                self.settings.get("trakt", {}).get("client_secret"),
-            )
+            t = Trakt(client_id, client_secret)
             t.test_connection()
+            _VERIFIED_CONNECTIONS.add(key)
             return True
         except Exception as err:
             logger.error("Failed to connect to Trakt, check your configuration.")
-            logger.debug(f"Error: {err}")
+            logger.debug("Error: %s", err)
             return False
 
     def validate_settings_for_instance(self, library):
@@ -86,40 +204,63 @@ class Config:
                 and instance_type not in SETTINGS_PER_INSTANCE[setting]
             ):
                 self.log_and_exit(
-                    f"'{setting}' can only be set for instances of type: {SETTINGS_PER_INSTANCE[setting]}"
+                    f"'{setting}' can only be set for instances of type: {sorted(SETTINGS_PER_INSTANCE[setting])}"
                 )
 
+    def validate_instance_settings(self):
+        for instance_type in VALID_INSTANCE_TYPES:
+            # An empty section (`sonarr:`) parses as None
+            connections = self.settings.get(instance_type) or []
+            if not isinstance(connections, list) or not all(
+                isinstance(connection, dict) for connection in connections
+            ):
+                self.log_and_exit(
+                    "sonarr and radarr settings should be a list of dictionaries."
+                )
+
+        return True
+
     def validate_sonarr_and_radarr(self):
-        sonarr_settings = self.settings.get("sonarr", [])
-        radarr_settings = self.settings.get("radarr", [])
+        sonarr_settings = self.settings.get("sonarr") or []
+        radarr_settings = self.settings.get("radarr") or []
 
-        # Check if sonarr_settings and radarr_settings are lists
-        if not isinstance(sonarr_settings, list) or not isinstance(
-            radarr_settings, list
-        ):
-            self.log_and_exit(
-                "sonarr and radarr settings should be a list of dictionaries."
-            )
+        total_connections = len(sonarr_settings) + len(radarr_settings)
+        if not total_connections:
+            return True
 
-        return all(
-            self.test_api_connection(connection)
-            for connection in sonarr_settings + radarr_settings
-        )
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_PROBES, total_connections)
+        ) as executor:
+            return all(
+                list(
+                    executor.map(
+                        self.test_api_connection,
+                        chain(sonarr_settings, radarr_settings),
+                    )
+                )
+            )
 
     def test_api_connection(self, connection):
+        key = connection_key(connection["url"], connection["api_key"])
+        if key in _VERIFIED_CONNECTIONS:
+            return True
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 f"{connection['url']}/api",
                 params={"apiKey": connection["api_key"]},
                 headers={"Content-Type": "application/json"},
+                timeout=PROBE_TIMEOUT,
             )
             response.raise_for_status()
+            _VERIFIED_CONNECTIONS.add(key)
             return True
         except requests.exceptions.RequestException as err:
             logger.error(
-                f"Failed to connect to {connection['name']} at {connection['url']}, check your configuration."
+                "Failed to connect to %s at %s, check your configuration.",
+                connection["name"],
+                connection["url"],
             )
-            logger.debug(f"Error: {err}")
+            logger.debug("Error: %s", err)
             return False
 
     def validate_tautulli(self):
@@ -127,16 +268,21 @@ class Config:
             tautulli_config = self.settings.get("tautulli")
             if not tautulli_config:
                 raise KeyError
+            key = connection_key(tautulli_config["url"], tautulli_config["api_key"])
+            if key in _VERIFIED_CONNECTIONS:
+                return True
             tautulli = Tautulli(tautulli_config["url"], tautulli_config["api_key"])
             tautulli.test_connection()
+            _VERIFIED_CONNECTIONS.add(key)
         except KeyError:
             logger.error("Tautulli configuration not found, check your configuration.")
             return False
         except Exception as err:
             logger.error(
-                f"Failed to connect to tautulli at {tautulli_config['url']}, check your configuration."
+                "Failed to connect to tautulli at %s, check your configuration.",
+                tautulli_config["url"],
             )
-            logger.debug(f"Error: {err}")
+            logger.debug("Error: %s", err)
             return False
 
         return True
@@ -151,24 +297,25 @@ class Config:
             )
 
         for library in libraries:
-            self.validate_library_connections(library)
-            self.validate_disk_size_threshold(library)
-            self.validate_trakt_configuration(library, trakt_configured)
             self.validate_action_mode(library)
             self.validate_watch_status(library)
+            self.validate_conflicting_settings(library)
             self.validate_sort_configuration(library)
             self.validate_settings_for_instance(library)
+            self.validate_disk_size_threshold(library)
+            self.validate_trakt_configuration(library, trakt_configured)
+            self.validate_library_connections(library)
 
         return True
 
     def validate_library_connections(self, library):
-        self.validate_connection(library, "sonarr")
-        self.validate_connection(library, "radarr")
+        for connection_name in VALID_INSTANCE_TYPES:
+            self.validate_connection(library, connection_name)
 
     def validate_connection(self, library, connection_name):
-        if connection_name in library and not any(
-            connection["name"] == library[connection_name]
-            for connection in self.settings.get(connection_name, [])
+        if (
+            connection_name in library
+            and library[connection_name] not in self._configured_names[connection_name]
         ):
             self.log_and_exit(
                 f"{connection_name.capitalize()} '{library[connection_name]}' is not configured. Please check your configuration."
@@ -196,48 +343,49 @@ class Config:
             )
 
     def validate_action_mode(self, library):
-        if library["action_mode"] not in VALID_ACTION_MODES:
+        action_mode = library["action_mode"]
+        if action_mode not in VALID_ACTION_MODES:
             self.log_and_exit(
-                f"Invalid action_mode '{library['action_mode']}' in library '{library['name']}', it should be either 'delete'."
+                f"Invalid action_mode '{action_mode}' in library '{library['name']}', it should be either 'delete'."
             )
 
         # Validate settings per action
         for setting in library:
-            if setting in SETTINGS_PER_ACTION and library[
-                "action_mode"
-            ] not in SETTINGS_PER_ACTION.get(setting, []):
+            if (
+                setting in SETTINGS_PER_ACTION
+                and action_mode not in SETTINGS_PER_ACTION.get(setting, [])
+            ):
                 self.log_and_exit(
-                    f"'{setting}' can only be set when action_mode is '{library['action_mode']}' for library '{library['name']}'."
+                    f"'{setting}' can only be set when action_mode is '{action_mode}' for library '{library['name']}'."
                 )
 
     def validate_watch_status(self, library):
-        if "watch_status" in library and library["watch_status"] not in [
-            "watched",
-            "unwatched",
-        ]:
-            self.log_and_exit(
-                f"Invalid watch_status '{library.get('watch_status')}' in library '{library.get('name')}', it must be either 'watched', 'unwatched', or not set."
-            )
+        if "watch_status" not in library:
+            return
 
-        if (
-            "watch_status" in library
-            and "apply_last_watch_threshold_to_collections" in library
-        ):
+        watch_status = library["watch_status"]
+        if watch_status not in VALID_WATCH_STATUSES:
             self.log_and_exit(
-                f"'apply_last_watch_threshold_to_collections' cannot be used when 'watch_status' is set in library '{library.get('name')}'. This would mean entire collections would be deleted when a single item in the collection meets the watch_status criteria."
+                f"Invalid watch_status '{watch_status}' in library '{library.get('name')}', it must be either 'watched', 'unwatched', or not set."
             )
 
+    def validate_conflicting_settings(self, library):
+        for settings, message in CONFLICTING_SETTINGS:
+            if all(setting in library for setting in settings):
+                self.log_and_exit(message.format(name=library.get("name")))
+
     def validate_sort_configuration(self, library):
         if sort_config := library.get("sort", {}):
+            name = library["name"]
             sort_field = sort_config.get("field")
             sort_order = sort_config.get("order")
 
             if sort_field and sort_field not in VALID_SORT_FIELDS:
                 self.log_and_exit(
-                    f"Invalid sort field '{sort_field}' in library '{library['name']}', supported values are {VALID_SORT_FIELDS}."
+                    f"Invalid sort field '{sort_field}' in library '{name}', supported values are {sorted(VALID_SORT_FIELDS)}."
                 )
 
             if sort_order and sort_order not in VALID_SORT_ORDERS:
                 self.log_and_exit(
-                    f"Invalid sort order '{sort_order}' in library '{library['name']}', supported values are {VALID_SORT_ORDERS}."
+                    f"Invalid sort order '{sort_order}' in library '{name}', supported values are {sorted(VALID_SORT_ORDERS)}."
                 )
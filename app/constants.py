@@ -1,27 +1,40 @@
 # Valid sort fields
-VALID_SORT_FIELDS = [
-    "title",
-    "size",
-    "release_year",
-    "runtime",
-    "added_date",
-    "rating",
-    "seasons",
-    "episodes",
-]
+VALID_SORT_FIELDS = frozenset(
+    {
+        "title",
+        "size",
+        "release_year",
+        "runtime",
+        "added_date",
+        "rating",
+        "seasons",
+        "episodes",
+    }
+)
 
 VALID_INSTANCE_TYPES = ["radarr", "sonarr"]
 
 # Valid sort orders
-VALID_SORT_ORDERS = ["asc", "desc"]
+VALID_SORT_ORDERS = frozenset({"asc", "desc"})
 
 # Valid action modes
-VALID_ACTION_MODES = ["delete"]
+VALID_ACTION_MODES = frozenset({"delete"})
+
+# Valid watch statuses
+VALID_WATCH_STATUSES = frozenset({"watched", "unwatched"})
 
 SETTINGS_PER_ACTION = {
-    "add_list_exclusion_on_delete": ["delete"],
+    "add_list_exclusion_on_delete": frozenset({"delete"}),
 }
 
 SETTINGS_PER_INSTANCE = {
-    "add_list_exclusion_on_delete": ["radarr"],
+    "add_list_exclusion_on_delete": frozenset({"radarr"}),
 }
+
+# Settings that cannot be set together in the same library
+CONFLICTING_SETTINGS = [
+    (
+        ("watch_status", "apply_last_watch_threshold_to_collections"),
+        "'apply_last_watch_threshold_to_collections' cannot be used when 'watch_status' is set in library '{name}'. This would mean entire collections would be deleted when a single item in the collection meets the watch_status criteria.",
+    ),
+]
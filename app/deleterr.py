@@ -1,8 +1,11 @@
 # encoding: utf-8
 
 import argparse
+import functools
 import locale
 import os
+from collections import defaultdict
+from pathlib import Path
 
 from pyarr.radarr import RadarrAPI
 from pyarr.sonarr import SonarrAPI
@@ -10,7 +13,9 @@ from pyarr.sonarr import SonarrAPI
 from app import logger
 from app.config import load_config
 from app.media_cleaner import MediaCleaner
-from app.utils import print_readable_freed_space
+from app.utils import create_session, print_readable_freed_space
+
+COMMIT_TAG_FILE = "/app/commit_tag.txt"
 
 
 class Deleterr:
@@ -19,61 +24,126 @@ class Deleterr:
 
         self.media_cleaner = MediaCleaner(config)
 
+        # One pooled session shared by every Arr client, instead of one per client
+        self.session = create_session()
+
         self.sonarr = {
-            connection["name"]: SonarrAPI(connection["url"], connection["api_key"])
-            for connection in config.settings.get("sonarr", [])
+            connection["name"]: self.create_client(SonarrAPI, connection)
+            for connection in config.settings.get("sonarr") or []
         }
         self.radarr = {
-            connection["name"]: RadarrAPI(connection["url"], connection["api_key"])
-            for connection in config.settings.get("radarr", [])
+            connection["name"]: self.create_client(RadarrAPI, connection)
+            for connection in config.settings.get("radarr") or []
         }
 
+    def create_client(self, api_class, connection):
+        client = api_class(connection["url"], connection["api_key"])
+        client.session = self.session
+        return client
+
+    def get_libraries_by_instance(self, instance_type):
+        libraries_by_instance = defaultdict(list)
+        for library in self.config.settings.get("libraries", []):
+            if name := library.get(instance_type):
+                libraries_by_instance[name].append(library)
+        return libraries_by_instance
+
+    def run(self):
+        # Sonarr first, then Radarr, one library at a time: a library's disk
+        # space threshold and watched collections depend on the ones before it
         self.process_sonarr()
         self.process_radarr()
 
     def process_radarr(self):
+        if not self.radarr:
+            return
+
+        libraries_by_instance = self.get_libraries_by_instance("radarr")
         for name, radarr in self.radarr.items():
-            logger.info("Processing radarr instance: '%s'", name)
-            all_movie_data = radarr.get_movie()
-
-            saved_space = 0
-            for library in self.config.settings.get("libraries", []):
-                if library.get("radarr") == name:
-                    saved_space += self.media_cleaner.process_library_movies(
-                        library, radarr, all_movie_data
-                    )
-
-            logger.info(
-                "Freed %s of space by deleting movies",
-                print_readable_freed_space(saved_space),
-            )
+            self.process_radarr_instance(name, radarr, libraries_by_instance[name])
+
+    def process_radarr_instance(self, name, radarr, libraries):
+        # Fetching every item of an instance no library uses would be wasted
+        if not libraries:
+            logger.debug("No libraries use radarr instance '%s', skipping", name)
+            return
+
+        logger.info("Processing radarr instance: '%s'", name)
+        all_movie_data = radarr.get_movie()
+
+        saved_space = sum(
+            self.media_cleaner.process_library_movies(library, radarr, all_movie_data)
+            for library in libraries
+        )
+
+        logger.info(
+            "Freed %s of space by deleting movies from '%s'",
+            print_readable_freed_space(saved_space),
+            name,
+        )
 
     def process_sonarr(self):
+        if not self.sonarr:
+            return
+
+        libraries_by_instance = self.get_libraries_by_instance("sonarr")
         for name, sonarr in self.sonarr.items():
-            logger.info("Processing sonarr instance: '%s'", name)
-            unfiltered_all_show_data = sonarr.get_series()
-
-            saved_space = 0
-            for library in self.config.settings.get("libraries", []):
-                if library.get("sonarr") == name:
-                    saved_space += self.media_cleaner.process_library(
-                        library, sonarr, unfiltered_all_show_data
-                    )
-
-            logger.info(
-                "Freed %s of space by deleting shows",
-                print_readable_freed_space(saved_space),
+            self.process_sonarr_instance(name, sonarr, libraries_by_instance[name])
+
+    def process_sonarr_instance(self, name, sonarr, libraries):
+        # Fetching every item of an instance no library uses would be wasted
+        if not libraries:
+            logger.debug("No libraries use sonarr instance '%s', skipping", name)
+            return
+
+        logger.info("Processing sonarr instance: '%s'", name)
+        unfiltered_all_show_data = sonarr.get_series()
+
+        saved_space = sum(
+            self.media_cleaner.process_library(
+                library, sonarr, unfiltered_all_show_data
             )
+            for library in libraries
+        )
+
+        logger.info(
+            "Freed %s of space by deleting shows from '%s'",
+            print_readable_freed_space(saved_space),
+            name,
+        )
 
 
 def get_file_contents(file_path):
     try:
-        with open(file_path, "r") as file:
-            return file.read().strip()
+        return Path(file_path).read_text(encoding="ascii").strip()
     except FileNotFoundError:
-        print(f"File not found: {file_path}")
-    except IOError as e:
-        print(f"Error reading file {file_path}: {e}")
+        logger.warning("File not found: %s", file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning("Error reading file %s: %s", file_path, e)
+
+
+@functools.lru_cache(maxsize=1)
+def get_commit_tag():
+    return get_file_contents(COMMIT_TAG_FILE)
+
+
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    parser = argparse.ArgumentParser(description="Process some integers.")
+    parser.add_argument(
+        "--config",
+        "--c",
+        default="/config/settings.yaml",
+        help="Path to the config file",
+    )
+    return parser
+
+
+@functools.lru_cache(maxsize=1)
+def init_locale():
+    # Nothing is formatted with locale-aware APIs, so only opt in on request
+    if os.environ.get("DELETERR_USE_LOCALE"):
+        locale.setlocale(locale.LC_ALL, "")
 
 
 def main():
@@ -82,29 +152,22 @@ def main():
     initializes the application.
     """
 
-    locale.setlocale(locale.LC_ALL, "")
+    init_locale()
 
     log_level = os.environ.get("LOG_LEVEL", "info").upper()
     logger.init_logger(
         console=True, log_dir="/config/logs", verbose=log_level == "DEBUG"
     )
 
-    logger.info("Running version %s", get_file_contents("/app/commit_tag.txt"))
+    logger.info("Running version %s", get_commit_tag())
     logger.info("Log level set to %s", log_level)
 
-    parser = argparse.ArgumentParser(description="Process some integers.")
-    parser.add_argument(
-        "--config",
-        "--c",
-        default="/config/settings.yaml",
-        help="Path to the config file",
-    )
-    args = parser.parse_args()
+    args = build_parser().parse_args()
 
     config = load_config(args.config)
     config.validate()
 
-    Deleterr(config)
+    Deleterr(config).run()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import requests
@@ -21,14 +23,16 @@ class MediaCleaner:
         self.watched_collections = set()
 
         # Setup connections
+        tautulli_config = config.settings.get("tautulli")
         self.tautulli = Tautulli(
-            config.settings.get("tautulli").get("url"),
-            config.settings.get("tautulli").get("api_key"),
+            tautulli_config.get("url"),
+            tautulli_config.get("api_key"),
         )
 
+        trakt_config = config.settings.get("trakt", {})
         self.trakt = Trakt(
-            config.settings.get("trakt", {}).get("client_id"),
-            config.settings.get("trakt", {}).get("client_secret"),
+            trakt_config.get("client_id"),
+            trakt_config.get("client_secret"),
         )
 
         # Disable SSL verification to support required secure connections
@@ -36,9 +40,10 @@ class MediaCleaner:
         session = requests.Session()
         session.verify = False
 
+        plex_config = config.settings.get("plex")
         self.plex = PlexServer(
-            config.settings.get("plex").get("url"),
-            config.settings.get("plex").get("token"),
+            plex_config.get("url"),
+            plex_config.get("token"),
             timeout=120,
             session=session,
         )
@@ -78,14 +83,18 @@ class MediaCleaner:
 
         logger.info("Processing library '%s'", library.get("name"))
 
-        trakt_items = self.get_trakt_items("show", library)
-        logger.info("Got %s trakt items to exclude", len(trakt_items))
+        # Trakt lists don't depend on Plex, fetch them while Plex and Tautulli are queried
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            trakt_future = executor.submit(self.get_trakt_items, "show", library)
 
-        plex_library = self.get_plex_library(library)
-        logger.info("Got %s items in plex library", plex_library.totalSize)
+            plex_library = self.get_plex_library(library)
+            logger.info("Got %s items in plex library", plex_library.totalSize)
 
-        show_activity = self.get_show_activity(library, plex_library)
-        logger.info("Got %s items in tautulli activity", len(show_activity))
+            show_activity = self.get_show_activity(library, plex_library)
+            logger.info("Got %s items in tautulli activity", len(show_activity))
+
+            trakt_items = trakt_future.result()
+            logger.info("Got %s trakt items to exclude", len(trakt_items))
 
         return self.process_shows(
             library,
@@ -114,7 +123,7 @@ class MediaCleaner:
         ):
             if max_actions_per_run and actions_performed >= max_actions_per_run:
                 logger.info(
-                    f"Reached max actions per run ({max_actions_per_run}), stopping"
+                    "Reached max actions per run (%s), stopping", max_actions_per_run
                 )
                 break
 
@@ -127,9 +136,9 @@ class MediaCleaner:
             )
             actions_performed += 1
 
-            if self.config.settings.get("action_delay"):
+            if action_delay := self.config.settings.get("action_delay"):
                 # sleep in seconds
-                time.sleep(self.config.settings.get("action_delay"))
+                time.sleep(action_delay)
 
         return saved_space
 
@@ -207,9 +216,11 @@ class MediaCleaner:
 
         logger.info("Processing library '%s'", library.get("name"))
 
-        trakt_movies = self.get_trakt_items("movie", library)
-        movies_library = self.get_plex_library(library)
-        movie_activity = self.get_movie_activity(library, movies_library)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            trakt_future = executor.submit(self.get_trakt_items, "movie", library)
+            movies_library = self.get_plex_library(library)
+            movie_activity = self.get_movie_activity(library, movies_library)
+            trakt_movies = trakt_future.result()
 
         return self.process_movies(
             library,
@@ -238,7 +249,7 @@ class MediaCleaner:
         ):
             if max_actions_per_run and actions_performed >= max_actions_per_run:
                 logger.info(
-                    f"Reached max actions per run ({max_actions_per_run}), stopping"
+                    "Reached max actions per run (%s), stopping", max_actions_per_run
                 )
                 break
 
@@ -251,9 +262,9 @@ class MediaCleaner:
             )
             actions_performed += 1
 
-            if self.config.settings.get("action_delay"):
+            if action_delay := self.config.settings.get("action_delay"):
                 # sleep in seconds
-                time.sleep(self.config.settings.get("action_delay"))
+                time.sleep(action_delay)
 
         return saved_space
 
@@ -295,22 +306,34 @@ class MediaCleaner:
         # Mark all episodes as unmonitored so they don't get re-downloaded while we're deleting them
         sonarr.upd_episode_monitor([episode["id"] for episode in episodes], False)
 
-        # delete the files
+        # delete the files, once per file since multi-episode files are shared
+        episode_file_ids = dict.fromkeys(
+            episode["episodeFileId"]
+            for episode in episodes
+            if episode["episodeFileId"] != 0
+        )
         skip_deleting_show = False
-        for episode in episodes:
+        for episode_file_id in episode_file_ids:
             try:
-                if episode["episodeFileId"] != 0:
-                    sonarr.del_episode_file(episode["episodeFileId"])
+                sonarr.del_episode_file(episode_file_id)
             except PyarrResourceNotFound as e:
                 # If the episode file doesn't exist, it's probably because it was already deleted by sonarr
                 # Sometimes happens for multi-episode files
                 logger.debug(
-                    f"Failed to delete episode file {episode['episodeFileId']} for show {sonarr_show['id']} ({sonarr_show['title']}): {e}"
+                    "Failed to delete episode file %s for show %s (%s): %s",
+                    episode_file_id,
+                    sonarr_show["id"],
+                    sonarr_show["title"],
+                    e,
                 )
             except PyarrServerError as e:
                 # If the episode file is still in use, we can't delete the show
                 logger.error(
-                    f"Failed to delete episode file {episode['episodeFileId']} for show {sonarr_show['id']} ({sonarr_show['title']}): {e}"
+                    "Failed to delete episode file %s for show %s (%s): %s",
+                    episode_file_id,
+                    sonarr_show["id"],
+                    sonarr_show["title"],
+                    e,
                 )
                 skip_deleting_show = True
                 break
@@ -320,7 +343,9 @@ class MediaCleaner:
             sonarr.del_series(sonarr_show["id"], delete_files=True)
         else:
             logger.info(
-                f"Skipping deleting show {sonarr_show['id']} ({sonarr_show['title']}) due to errors deleting episode files. It will be deleted on the next run."
+                "Skipping deleting show %s (%s) due to errors deleting episode files. It will be deleted on the next run.",
+                sonarr_show["id"],
+                sonarr_show["title"],
             )
 
     def delete_movie_if_allowed(
@@ -403,11 +428,15 @@ class MediaCleaner:
         return None
 
     def find_by_guid(self, plex_library, guid):
+        if plex_media_item := plex_library.by_guid.get(guid):
+            return plex_media_item
+
+        # Activity guids may only be part of a Plex guid, fall back to a scan
         for guids, plex_media_item in plex_library:
             for plex_guid in guids:
                 if guid in plex_guid:
                     return plex_media_item
-        logger.debug(f"{guid} not found in Plex")
+        logger.debug("%s not found in Plex", guid)
         return None
 
     def match_title_and_year(self, plex_media_item, title, year):
@@ -429,8 +458,10 @@ class MediaCleaner:
         return False
 
     def find_by_title_and_year(self, plex_library, title, year, alternate_titles):
-        for _, plex_media_item in plex_library:
-            for t in [title] + alternate_titles:
+        titles = [title] + alternate_titles
+        # Only items whose title is one of the searched ones can match, in library order
+        for _, plex_media_item in plex_library.with_titles(titles, year):
+            for t in titles:
                 if self.match_title_and_year(
                     plex_media_item, t, year
                 ) and self.match_year(plex_media_item, year):
@@ -438,16 +469,15 @@ class MediaCleaner:
         return None
 
     def find_by_tvdb_id(self, plex_library, tvdb_id):
-        for _, plex_media_item in plex_library:
-            for guid in plex_media_item.guids:
-                if f"tvdb://{tvdb_id}" in guid.id:
-                    return plex_media_item
-        return None
+        return self.find_by_external_guid(plex_library, f"tvdb://{tvdb_id}")
 
     def find_by_imdb_id(self, plex_library, imdb_id):
+        return self.find_by_external_guid(plex_library, f"imdb://{imdb_id}")
+
+    def find_by_external_guid(self, plex_library, external_guid):
         for _, plex_media_item in plex_library:
             for guid in plex_media_item.guids:
-                if f"imdb://{imdb_id}" in guid.id:
+                if external_guid in guid.id:
                     return plex_media_item
         return None
 
@@ -461,27 +491,31 @@ class MediaCleaner:
             "apply_last_watch_threshold_to_collections", False
         )
 
-        plex_guid_item_pair = [
+        plex_guid_item_pair = PlexLibraryIndex(
             (
                 [plex_media_item.guid] + [g.id for g in plex_media_item.guids],
                 plex_media_item,
             )
             for plex_media_item in plex_library.all()
-        ]
+        )
         if apply_last_watch_threshold_to_collections:
             logger.debug("Gathering collection watched status")
+            now = datetime.now()
             for guid, watched_data in activity_data.items():
                 plex_media_item = self.get_plex_item(plex_guid_item_pair, guid=guid)
                 if plex_media_item is None:
                     continue
-                last_watched = (datetime.now() - watched_data["last_watched"]).days
+                last_watched = (now - watched_data["last_watched"]).days
                 if (
                     plex_media_item.collections
                     and last_watched_threshold is not None
                     and last_watched < last_watched_threshold
                 ):
                     logger.debug(
-                        f"{watched_data['title']} watched {last_watched} days ago, adding collection {plex_media_item.collections} to watched collections"
+                        "%s watched %s days ago, adding collection %s to watched collections",
+                        watched_data["title"],
+                        last_watched,
+                        plex_media_item.collections,
                     )
                     self.watched_collections = self.watched_collections | {
                         c.tag for c in plex_media_item.collections
@@ -500,11 +534,15 @@ class MediaCleaner:
             if plex_media_item is None:
                 if media_data.get("statistics", {}).get("episodeFileCount", 0) == 0:
                     logger.debug(
-                        f"{media_data['title']} ({media_data['year']}) not found in Plex, but has no episodes, skipping"
+                        "%s (%s) not found in Plex, but has no episodes, skipping",
+                        media_data["title"],
+                        media_data["year"],
                     )
                 else:
                     logger.warning(
-                        f"UNMATCHED: {media_data['title']} ({media_data['year']}) not found in Plex."
+                        "UNMATCHED: %s (%s) not found in Plex.",
+                        media_data["title"],
+                        media_data["year"],
                     )
                     unmatched += 1
                 continue
@@ -522,7 +560,7 @@ class MediaCleaner:
 
             yield media_data
 
-        logger.info(f"Found {len(all_data)} items, {unmatched} unmatched")
+        logger.info("Found %s items, %s unmatched", len(all_data), unmatched)
 
     def is_movie_actionable(
         self,
@@ -574,14 +612,16 @@ class MediaCleaner:
             last_watched = (datetime.now() - watched_data["last_watched"]).days
             if last_watched_threshold and last_watched < last_watched_threshold:
                 logger.debug(
-                    f"{media_data['title']} watched {last_watched} days ago, skipping"
+                    "%s watched %s days ago, skipping",
+                    media_data["title"],
+                    last_watched,
                 )
                 return False
             if library.get("watch_status") == "unwatched":
-                logger.debug(f"{media_data['title']} watched, skipping")
+                logger.debug("%s watched, skipping", media_data["title"])
                 return False
         elif library.get("watch_status") == "watched":
-            logger.debug(f"{media_data['title']} not watched, skipping")
+            logger.debug("%s not watched, skipping", media_data["title"])
             return False
 
         return True
@@ -597,16 +637,22 @@ class MediaCleaner:
                 {c.tag for c in plex_media_item.collections}
             ):
                 logger.debug(
-                    f"{media_data['title']} has watched collections ({already_watched}), skipping"
+                    "%s has watched collections (%s), skipping",
+                    media_data["title"],
+                    already_watched,
                 )
                 return False
 
         return True
 
     def check_trakt_movies(self, media_data, trakt_movies):
-        if media_data.get("tvdb_id", media_data.get("tmdbId")) in trakt_movies:
+        if trakt_item := trakt_movies.get(
+            media_data.get("tvdb_id", media_data.get("tmdbId"))
+        ):
             logger.debug(
-                f"{media_data['title']} found in trakt watched list {trakt_movies[media_data.get('tvdb_id', media_data.get('tmdbId'))]['list']}, skipping"
+                "%s found in trakt watched list %s, skipping",
+                media_data["title"],
+                trakt_item["list"],
             )
             return False
 
@@ -615,7 +661,9 @@ class MediaCleaner:
     def check_added_date(self, media_data, plex_media_item, added_at_threshold):
         date_added = (datetime.now() - plex_media_item.addedAt).days
         if added_at_threshold and date_added < added_at_threshold:
-            logger.debug(f"{media_data['title']} added {date_added} days ago, skipping")
+            logger.debug(
+                "%s added %s days ago, skipping", media_data["title"], date_added
+            )
             return False
 
         return True
@@ -640,48 +688,103 @@ class MediaCleaner:
         )
 
 
+class PlexLibraryIndex:
+    """
+    The (guids, item) pairs of a Plex library, indexed by guid and by lowercased
+    title so matching an item doesn't scan the whole library.
+    """
+
+    def __init__(self, plex_guid_item_pairs):
+        self.pairs = list(plex_guid_item_pairs)
+        self.by_guid = {}
+        self.by_title = defaultdict(list)
+        for position, (guids, plex_media_item) in enumerate(self.pairs):
+            for guid in guids or []:
+                self.by_guid.setdefault(guid, plex_media_item)
+            self.by_title[plex_media_item.title.lower()].append(position)
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def with_titles(self, titles, year):
+        """
+        Returns the pairs whose item is titled as one of the titles, optionally
+        followed by the year, in library order.
+        """
+        positions = set()
+        for title in titles:
+            title = title.lower()
+            positions.update(self.by_title.get(title, []))
+            positions.update(self.by_title.get(f"{title} ({year})", []))
+        return [self.pairs[position] for position in sorted(positions)]
+
+
+def find_excluded_tag(excluded, plex_media_item, attribute):
+    """
+    Returns the first value in excluded matching, case insensitively, one of
+    the tags in the given attribute of the plex item, or None.
+    """
+    if not excluded:
+        return None
+
+    # Lower the item tags once instead of once per excluded value
+    tags = {tag.tag.lower() for tag in getattr(plex_media_item, attribute)}
+    return next((value for value in excluded if value.lower() in tags), None)
+
+
 def check_excluded_titles(media_data, plex_media_item, exclude):
-    for title in exclude.get("titles", []):
-        if title.lower() == plex_media_item.title.lower():
-            logger.debug(f"{media_data['title']} has excluded title {title}, skipping")
-            return False
+    if titles := exclude.get("titles", []):
+        plex_title = plex_media_item.title.lower()
+        for title in titles:
+            if title.lower() == plex_title:
+                logger.debug(
+                    "%s has excluded title %s, skipping", media_data["title"], title
+                )
+                return False
     return True
 
 
 def check_excluded_genres(media_data, plex_media_item, exclude):
-    for genre in exclude.get("genres", []):
-        if genre.lower() in (g.tag.lower() for g in plex_media_item.genres):
-            logger.debug(f"{media_data['title']} has excluded genre {genre}, skipping")
-            return False
+    if genre := find_excluded_tag(exclude.get("genres", []), plex_media_item, "genres"):
+        logger.debug("%s has excluded genre %s, skipping", media_data["title"], genre)
+        return False
     return True
 
 
 def check_excluded_collections(media_data, plex_media_item, exclude):
-    for collection in exclude.get("collections", []):
-        if collection.lower() in (g.tag.lower() for g in plex_media_item.collections):
-            logger.debug(
-                f"{media_data['title']} has excluded collection {collection}, skipping"
-            )
-            return False
+    if collection := find_excluded_tag(
+        exclude.get("collections", []), plex_media_item, "collections"
+    ):
+        logger.debug(
+            "%s has excluded collection %s, skipping", media_data["title"], collection
+        )
+        return False
     return True
 
 
 def check_excluded_labels(media_data, plex_media_item, exclude):
-    for label in exclude.get("plex_labels", []):
-        if label.lower() in (g.tag.lower() for g in plex_media_item.labels):
-            logger.debug(f"{media_data['title']} has excluded label {label}, skipping")
-            return False
+    if label := find_excluded_tag(
+        exclude.get("plex_labels", []), plex_media_item, "labels"
+    ):
+        logger.debug("%s has excluded label %s, skipping", media_data["title"], label)
+        return False
     return True
 
 
 def check_excluded_release_years(media_data, plex_media_item, exclude):
-    if (
-        exclude.get("release_years", 0)
-        and plex_media_item.year
-        and plex_media_item.year >= datetime.now().year - exclude.get("release_years")
-    ):
+    release_years = exclude.get("release_years", 0)
+    if not release_years or not plex_media_item.year:
+        return True
+
+    current_year = datetime.now().year
+    if plex_media_item.year >= current_year - release_years:
         logger.debug(
-            f"{media_data['title']} ({plex_media_item.year}) was released within the threshold years ({datetime.now().year} - {exclude.get('release_years', 0)} = {datetime.now().year - exclude.get('release_years', 0)}), skipping"
+            "%s (%s) was released within the threshold years (%s - %s = %s), skipping",
+            media_data["title"],
+            plex_media_item.year,
+            current_year,
+            release_years,
+            current_year - release_years,
         )
         return False
     return True
@@ -692,49 +795,65 @@ def check_excluded_studios(media_data, plex_media_item, exclude):
         "studios", []
     ):
         logger.debug(
-            f"{media_data['title']} has excluded studio {plex_media_item.studio}, skipping"
+            "%s has excluded studio %s, skipping",
+            media_data["title"],
+            plex_media_item.studio,
         )
         return False
     return True
 
 
 def check_excluded_producers(media_data, plex_media_item, exclude):
-    for producer in exclude.get("producers", []):
-        if producer.lower() in (g.tag.lower() for g in plex_media_item.producers):
-            logger.debug(
-                f"{media_data['title']} [{plex_media_item}] has excluded producer {producer}, skipping"
-            )
-            return False
+    if producer := find_excluded_tag(
+        exclude.get("producers", []), plex_media_item, "producers"
+    ):
+        logger.debug(
+            "%s [%s] has excluded producer %s, skipping",
+            media_data["title"],
+            plex_media_item,
+            producer,
+        )
+        return False
     return True
 
 
 def check_excluded_directors(media_data, plex_media_item, exclude):
-    for director in exclude.get("directors", []):
-        if director.lower() in (g.tag.lower() for g in plex_media_item.directors):
-            logger.debug(
-                f"{media_data['title']} [{plex_media_item}] has excluded director {director}, skipping"
-            )
-            return False
+    if director := find_excluded_tag(
+        exclude.get("directors", []), plex_media_item, "directors"
+    ):
+        logger.debug(
+            "%s [%s] has excluded director %s, skipping",
+            media_data["title"],
+            plex_media_item,
+            director,
+        )
+        return False
     return True
 
 
 def check_excluded_writers(media_data, plex_media_item, exclude):
-    for writer in exclude.get("writers", []):
-        if writer.lower() in (g.tag.lower() for g in plex_media_item.writers):
-            logger.debug(
-                f"{media_data['title']} [{plex_media_item}] has excluded writer {writer}, skipping"
-            )
-            return False
+    if writer := find_excluded_tag(
+        exclude.get("writers", []), plex_media_item, "writers"
+    ):
+        logger.debug(
+            "%s [%s] has excluded writer %s, skipping",
+            media_data["title"],
+            plex_media_item,
+            writer,
+        )
+        return False
     return True
 
 
 def check_excluded_actors(media_data, plex_media_item, exclude):
-    for actor in exclude.get("actors", []):
-        if actor.lower() in (g.tag.lower() for g in plex_media_item.roles):
-            logger.debug(
-                f"{media_data['title']} [{plex_media_item}] has excluded actor {actor}, skipping"
-            )
-            return False
+    if actor := find_excluded_tag(exclude.get("actors", []), plex_media_item, "roles"):
+        logger.debug(
+            "%s [%s] has excluded actor %s, skipping",
+            media_data["title"],
+            plex_media_item,
+            actor,
+        )
+        return False
     return True
 
 
@@ -769,7 +888,7 @@ def sort_media(media_list, sort_config):
     sort_field = sort_config.get("field", "title")
     sort_order = sort_config.get("order", "asc")
 
-    logger.debug(f"Sorting media by {sort_field} {sort_order}")
+    logger.debug("Sorting media by %s %s", sort_field, sort_order)
 
     sort_key = get_sort_key_function(sort_field)
 
@@ -811,26 +930,39 @@ def _get_config_value(config, key, default=None):
 
 
 def library_meets_disk_space_threshold(library, pyarr):
-    for item in library.get("disk_size_threshold", []):
+    thresholds = library.get("disk_size_threshold", [])
+    if not thresholds:
+        return True
+
+    # Fetch the disk space once and reuse it for every configured path
+    free_space_by_path = {
+        folder["path"]: folder["freeSpace"] for folder in pyarr.get_disk_space()
+    }
+
+    for item in thresholds:
         path = item.get("path")
         threshold = item.get("threshold")
-        disk_space = pyarr.get_disk_space()
-        folder_found = False
-        for folder in disk_space:
-            if folder["path"] == path:
-                folder_found = True
-                free_space = folder["freeSpace"]
-                logger.debug(
-                    f"Free space for '{path}': {print_readable_freed_space(free_space)} (threshold: {threshold})"
-                )
-                if free_space > parse_size_to_bytes(threshold):
-                    logger.info(
-                        f"Skipping library '{library.get('name')}' as free space is above threshold ({print_readable_freed_space(free_space)} > {threshold})"
-                    )
-                    return False
-        if not folder_found:
+        if path not in free_space_by_path:
             logger.error(
-                f"Could not find folder '{path}' in server instance. Skipping library '{library.get('name')}'"
+                "Could not find folder '%s' in server instance. Skipping library '%s'",
+                path,
+                library.get("name"),
+            )
+            return False
+
+        free_space = free_space_by_path[path]
+        logger.debug(
+            "Free space for '%s': %s (threshold: %s)",
+            path,
+            print_readable_freed_space(free_space),
+            threshold,
+        )
+        if free_space > parse_size_to_bytes(threshold):
+            logger.info(
+                "Skipping library '%s' as free space is above threshold (%s > %s)",
+                library.get("name"),
+                print_readable_freed_space(free_space),
+                threshold,
             )
             return False
     return True
@@ -28,8 +28,13 @@ def filter_by_most_recent(data, key, sort_key):
 
 
 class Tautulli:
+    __slots__ = ("api", "metadata_cache")
+
     def __init__(self, url, api_key):
         self.api = RawAPI(url, api_key, verify=False)
+        # Item metadata doesn't change during a run and is shared by libraries
+        # that point at the same Plex section
+        self.metadata_cache = {}
 
     def test_connection(self):
         self.api.status()
@@ -54,7 +59,7 @@ class Tautulli:
         filtered_data = filter_by_most_recent(raw_data, key, "stopped")
 
         for index, entry in enumerate(filtered_data):
-            metadata = self.api.get_metadata(entry[key])
+            metadata = self.get_metadata(entry[key])
             if metadata:
                 last_activity[metadata["guid"]] = self._prepare_activity_entry(
                     entry, metadata
@@ -63,6 +68,11 @@ class Tautulli:
 
         return last_activity
 
+    def get_metadata(self, rating_key):
+        if rating_key not in self.metadata_cache:
+            self.metadata_cache[rating_key] = self.api.get_metadata(rating_key)
+        return self.metadata_cache[rating_key]
+
     def _calculate_min_date(self, library_config):
         last_watched_threshold = library_config.get("last_watched_threshold", 0)
         added_at_threshold = library_config.get("added_at_threshold", 0)
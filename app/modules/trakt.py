@@ -4,10 +4,29 @@ import trakt
 
 from app import logger
 
+# Pattern to capture the username and list name
+USER_WATCHLIST_PATTERN = re.compile(
+    r"https://trakt.tv/users/(?P<username>[^/]+)/(?P<listname>(watchlist|favorites))"
+)
+# Pattern to capture the username and list name
+USER_LIST_PATTERN = re.compile(
+    r"https://trakt.tv/users/(?P<username>[^/]+)/lists/(?P<listname>[^/]+)"
+)
+# Pattern to capture trending, popular movies
+MOVIE_PATTERN = re.compile(
+    r"https://trakt.tv/(movies|shows)/(?P<listname>trending|popular|anticipated|boxoffice)"
+)
+# Pattern to capture watched, collected along with their period
+MOVIE_ACTION_PERIOD_PATTERN = re.compile(
+    r"https://trakt.tv/(movies|shows)/(?P<listname>favorited|watched|collected|)/(?P<period>daily|weekly|monthly|yearly)"
+)
+
 
 class Trakt:
     def __init__(self, trakt_id, trakt_secret):
         self._configure_trakt(trakt_id, trakt_secret)
+        # Libraries often exclude the same lists, fetch each one once per run
+        self._list_items_cache = {}
 
     def _configure_trakt(self, trakt_id, trakt_secret):
         trakt.Trakt.configuration.defaults.client(
@@ -28,10 +47,15 @@ class Trakt:
         items = {}
         max_items_per_list = trakt_config.get("max_items_per_list", 100)
         for url in trakt_config.get("lists", []):
-            username, listname, recurrence = extract_info_from_url(url)
-            list_items = self._fetch_list_items(
-                media_type, username, listname, recurrence, max_items_per_list
-            )
+            cache_key = (media_type, url, max_items_per_list)
+            if cache_key not in self._list_items_cache:
+                username, listname, recurrence = extract_info_from_url(url)
+                self._list_items_cache[cache_key] = list(
+                    self._fetch_list_items(
+                        media_type, username, listname, recurrence, max_items_per_list
+                    )
+                )
+            list_items = self._list_items_cache[cache_key]
             key = "tmdb" if media_type == "movie" else "tvdb"
             _process_trakt_item_list(items, list_items, url, key)
         return items
@@ -66,7 +90,7 @@ class Trakt:
             )  # Return empty list if no items are found
         elif listname == "favorites":
             logger.warning(
-                f"Traktpy does not support {listname} {media_type}s. Skipping..."
+                "Traktpy does not support %s %ss. Skipping...", listname, media_type
             )
             return []
 
@@ -83,7 +107,7 @@ class Trakt:
 
     def _fetch_recurrent_list_items(self, media_type, listname):
         logger.warning(
-            f"Traktpy does not support {listname} {media_type}s. Skipping..."
+            "Traktpy does not support %s %ss. Skipping...", listname, media_type
         )
         return []
 
@@ -115,7 +139,7 @@ def _process_trakt_item_list(items, list_items, url, key):
         try:
             items[int(m.get_key(key))] = {"trakt": m, "list": url}
         except TypeError:
-            logger.debug(f"Could not get {key} for {m}")
+            logger.debug("Could not get %s for %s", key, m)
 
 
 """
@@ -125,34 +149,23 @@ returns username, listname, recurrence
 
 
 def extract_info_from_url(url):
-    # Pattern to capture the username and list name
-    user_watchlist_pattern = r"https://trakt.tv/users/(?P<username>[^/]+)/(?P<listname>(watchlist|favorites))"
-    # Pattern to capture the username and list name
-    user_list_pattern = (
-        r"https://trakt.tv/users/(?P<username>[^/]+)/lists/(?P<listname>[^/]+)"
-    )
-    # Pattern to capture trending, popular movies
-    movie_pattern = r"https://trakt.tv/(movies|shows)/(?P<listname>trending|popular|anticipated|boxoffice)"
-    # Pattern to capture watched, collected along with their period
-    movie_action_period_pattern = r"https://trakt.tv/(movies|shows)/(?P<listname>favorited|watched|collected|)/(?P<period>daily|weekly|monthly|yearly)"
-
     # Check movie action with period pattern
-    match = re.match(movie_action_period_pattern, url)
+    match = MOVIE_ACTION_PERIOD_PATTERN.match(url)
     if match:
         return None, match.group("listname"), match.group("period")
 
     # Check movie pattern
-    match = re.match(movie_pattern, url)
+    match = MOVIE_PATTERN.match(url)
     if match:
         return None, match.group("listname"), None
 
     # Check user watchlist pattern
-    match = re.match(user_watchlist_pattern, url)
+    match = USER_WATCHLIST_PATTERN.match(url)
     if match:
         return match.group("username"), match.group("listname"), None
 
     # Check user list pattern
-    match = re.match(user_list_pattern, url)
+    match = USER_LIST_PATTERN.match(url)
     if match:
         return match.group("username"), match.group("listname"), None
 
@@ -1,6 +1,21 @@
+import functools
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 valid_units = ["B", "KB", "MB", "GB", "TB", "PB", "EB"]
 
+# Bytes per unit, each unit being 1024 times the previous one
+unit_multipliers = {unit: 1024**index for index, unit in enumerate(valid_units)}
+
+# Splits a size string like "1.5 TB" into its number and unit
+size_pattern = re.compile(r"^\s*(?P<size>[\d.]*)\s*(?P<unit>.*?)\s*$")
+
 
+# Items often share sizes (0 for missing files, totals logged more than once)
+@functools.lru_cache(maxsize=4096)
 def print_readable_freed_space(saved_space):
     index = 0
 
@@ -12,20 +27,40 @@ def print_readable_freed_space(saved_space):
 
 
 def parse_size_to_bytes(size_str):
-    unit = "".join([i for i in size_str if not i.isdigit() and i != "."]).strip()
-    size = "".join([i for i in size_str if i.isdigit() or i == "."])
-    size = float(size)
-    index = valid_units.index(unit)
+    match = size_pattern.match(size_str)
+    unit = match.group("unit")
 
-    while index > 0:
-        size *= 1024
-        index -= 1
+    if unit not in unit_multipliers:
+        raise ValueError(f"Invalid unit '{unit}'. Valid units are {valid_units}")
 
-    return int(size)
+    return int(float(match.group("size")) * unit_multipliers[unit])
 
 
 def validate_units(threshold):
-    unit = "".join([i for i in threshold if not i.isdigit() and i != "."]).strip()
+    unit = size_pattern.match(threshold).group("unit")
 
-    if unit not in valid_units:
+    if unit not in unit_multipliers:
         raise ValueError(f"Invalid unit '{unit}'. Valid units are {valid_units}")
+
+
+def create_session(pool_connections=16, pool_maxsize=32, retries=2):
+    """
+    Creates a requests session with pooled keep-alive connections that
+    retries GET and HEAD requests when the server answers 502, 503 or 504.
+    Deletions are never retried, a gateway timeout doesn't mean the server
+    didn't act on them.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
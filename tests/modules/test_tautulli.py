@@ -161,4 +161,20 @@ def test_get_activity_without_tautulli_items(
     # Assert
     assert result == {}
     mock_calculate_min_date.assert_called_once_with(library_config)
-    mock_fetch_history_data.assert_called_once_with(section, "2022-01-01")
\ No newline at end of file
+    mock_fetch_history_data.assert_called_once_with(section, "2022-01-01")
+
+
+def test_get_metadata_is_fetched_once_per_rating_key():
+    # Arrange
+    tautulli_instance = Tautulli("id", "secret")
+    tautulli_instance.api = MagicMock(
+        get_metadata=MagicMock(return_value={"guid": "guid"})
+    )
+
+    # Act
+    tautulli_instance.get_metadata("123")
+    result = tautulli_instance.get_metadata("123")
+
+    # Assert
+    assert result == {"guid": "guid"}
+    tautulli_instance.api.get_metadata.assert_called_once_with("123")
@@ -183,3 +183,22 @@ def test__fetch_general_list_items(media_type, trakt_instance_and_mock):
     # Test with other list
     result = trakt_instance._fetch_general_list_items(media_type, "other", 100)
     assert result == []
+
+
+@patch("app.modules.trakt._process_trakt_item_list")
+@patch.object(Trakt, "_fetch_list_items", return_value=[{"title": "Test Movie"}])
+def test_get_all_items_for_url_fetches_each_list_once(
+    mock_fetch_list, mock_process_list, trakt_instance_and_mock
+):
+    trakt_instance, _ = trakt_instance_and_mock
+
+    # Arrange
+    trakt_config = {"lists": ["https://trakt.tv/users/username/lists/listname"]}
+
+    # Act
+    trakt_instance._get_all_items_for_url("movie", trakt_config)
+    trakt_instance._get_all_items_for_url("movie", trakt_config)
+
+    # Assert
+    mock_fetch_list.assert_called_once()
+    assert mock_process_list.call_count == 2
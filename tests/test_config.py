@@ -1,6 +1,8 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 
-from app.config import Config
+from app.config import _VERIFIED_CONNECTIONS, Config, clear_config_cache, load_config
 from app.constants import (
     SETTINGS_PER_ACTION,
     SETTINGS_PER_INSTANCE,
@@ -73,7 +75,7 @@ def test_invalid_sorting_options(library_config):
         validator.validate_libraries()
 
 
-@pytest.mark.parametrize("action_mode", VALID_ACTION_MODES)
+@pytest.mark.parametrize("action_mode", sorted(VALID_ACTION_MODES))
 @pytest.mark.parametrize("setting", SETTINGS_PER_ACTION.keys())
 @pytest.mark.parametrize("instance", VALID_INSTANCE_TYPES)
 def test_settings_per_instance_and_action_mode(action_mode, setting, instance):
@@ -112,8 +114,8 @@ def test_settings_per_instance_and_action_mode(action_mode, setting, instance):
 
 
 # Test case for validate_libraries
-@pytest.mark.parametrize("sort_field", VALID_SORT_FIELDS)
-@pytest.mark.parametrize("sort_order", VALID_SORT_ORDERS)
+@pytest.mark.parametrize("sort_field", sorted(VALID_SORT_FIELDS))
+@pytest.mark.parametrize("sort_order", sorted(VALID_SORT_ORDERS))
 def test_valid_sorting_options(sort_field, sort_order):
     library_config = {
         "name": "TV Shows",
@@ -128,3 +130,144 @@ def test_valid_sorting_options(sort_field, sort_order):
 
     validator = Config({"libraries": [library_config], "sonarr": sonarr_config})
     assert validator.validate_libraries() == True
+
+
+def test_load_config_reuses_parsed_config(tmp_path):
+    config_file = tmp_path / "settings.yaml"
+    config_file.write_text("dry_run: true\n")
+    clear_config_cache()
+
+    first = load_config(str(config_file))
+    second = load_config(str(config_file))
+
+    assert first is second
+    assert first.settings == {"dry_run": True}
+
+
+def test_load_config_reparses_changed_file(tmp_path):
+    config_file = tmp_path / "settings.yaml"
+    config_file.write_text("dry_run: true\n")
+    clear_config_cache()
+
+    first = load_config(str(config_file))
+    config_file.write_text("dry_run: false\n")
+    second = load_config(str(config_file))
+
+    assert first is not second
+    assert second.settings == {"dry_run": False}
+
+
+@patch("app.config._SESSION.get")
+def test_api_connection_is_probed_once_per_endpoint(mock_get):
+    _VERIFIED_CONNECTIONS.clear()
+    mock_get.return_value = MagicMock()
+    connection = {"name": "test", "url": "http://localhost:8989", "api_key": "KEY"}
+    validator = Config({"sonarr": [connection]})
+
+    assert validator.test_api_connection(connection)
+    assert validator.test_api_connection(dict(connection))
+    mock_get.assert_called_once()
+
+    assert validator.test_api_connection({**connection, "api_key": "OTHER_KEY"})
+    assert mock_get.call_count == 2
+
+
+def test_validate_sonarr_and_radarr_checks_every_instance():
+    validator = Config(
+        {
+            "sonarr": [{"name": "sonarr", "url": "http://sonarr", "api_key": "A"}],
+            "radarr": [{"name": "radarr", "url": "http://radarr", "api_key": "B"}],
+        }
+    )
+
+    with patch.object(
+        Config, "test_api_connection", side_effect=[False, True]
+    ) as mock_test:
+        assert not validator.validate_sonarr_and_radarr()
+
+    assert mock_test.call_count == 2
+
+
+@pytest.mark.parametrize("instance", VALID_INSTANCE_TYPES)
+def test_validate_library_with_unconfigured_instance(instance):
+    library_config = {
+        "name": "TV Shows",
+        "action_mode": "delete",
+        instance: "missing",
+    }
+    instance_config = [
+        {"name": "test", "url": "http://localhost:8989", "api_key": "API_KEY"}
+    ]
+    validator = Config({"libraries": [library_config], instance: instance_config})
+
+    with pytest.raises(SystemExit):
+        validator.validate_libraries()
+
+
+def test_validate_config_is_memoized_until_settings_change():
+    validator = Config({"libraries": [{"name": "Movies", "action_mode": "delete"}]})
+
+    with patch.object(
+        Config, "validate_trakt", return_value=True
+    ) as mock_trakt, patch.object(
+        Config, "validate_sonarr_and_radarr", return_value=True
+    ), patch.object(
+        Config, "validate_tautulli", return_value=True
+    ):
+        assert validator.validate_config()
+        assert validator.validate_config()
+        assert mock_trakt.call_count == 1
+
+        validator.settings["dry_run"] = True
+        assert validator.validate_config()
+        assert mock_trakt.call_count == 2
+
+        validator.settings = dict(validator.settings)
+        assert validator.validate_config()
+        assert mock_trakt.call_count == 3
+
+
+def test_validate_conflicting_settings():
+    library_config = {
+        "name": "Movies",
+        "action_mode": "delete",
+        "watch_status": "watched",
+        "apply_last_watch_threshold_to_collections": True,
+    }
+    validator = Config({"libraries": [library_config]})
+
+    with pytest.raises(SystemExit):
+        validator.validate_libraries()
+
+
+@pytest.mark.parametrize("instance", VALID_INSTANCE_TYPES)
+def test_validate_config_rejects_instance_mapping(instance, caplog):
+    library_config = {"name": "Library", "action_mode": "delete", instance: "test"}
+    validator = Config(
+        {
+            "libraries": [library_config],
+            instance: {"name": "test", "url": "http://localhost", "api_key": "KEY"},
+        }
+    )
+
+    with pytest.raises(SystemExit):
+        validator.validate_config()
+
+    assert "should be a list of dictionaries" in caplog.text
+
+
+def test_validate_config_rejects_non_dict_instance_entries(caplog):
+    library_config = {"name": "Library", "action_mode": "delete", "sonarr": "foo"}
+    validator = Config({"libraries": [library_config], "sonarr": ["foo"]})
+
+    with pytest.raises(SystemExit):
+        validator.validate_config()
+
+    assert "should be a list of dictionaries" in caplog.text
+
+
+def test_validate_config_accepts_empty_instance_section():
+    validator = Config({"sonarr": None, "radarr": None})
+
+    assert validator.validate_instance_settings()
+    assert validator.validate_sonarr_and_radarr()
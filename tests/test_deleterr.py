@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.deleterr import Deleterr, main
+from app.deleterr import Deleterr, get_file_contents, init_locale, main
 
 
 @pytest.fixture
@@ -60,3 +60,108 @@ def test_process_sonarr(radarr_mock, sonarr_mock, deleterr):
         deleterr.sonarr["Sonarr1"],
         [{"title": "Test Movie"}],
     )
+
+
+def test_run_processes_sonarr_then_radarr_in_order(deleterr):
+    # Arrange
+    deleterr.sonarr = {"Sonarr1": MagicMock()}
+    deleterr.radarr = {"Radarr1": MagicMock(), "Radarr2": MagicMock()}
+    deleterr.config.settings = {
+        "libraries": [
+            {"name": "Movies", "radarr": "Radarr1"},
+            {"name": "TV Shows", "sonarr": "Sonarr1"},
+        ],
+    }
+    calls = []
+    deleterr.process_sonarr_instance = MagicMock(
+        side_effect=lambda name, *args: calls.append(name)
+    )
+    deleterr.process_radarr_instance = MagicMock(
+        side_effect=lambda name, *args: calls.append(name)
+    )
+
+    # Act
+    deleterr.run()
+
+    # Assert
+    assert calls == ["Sonarr1", "Radarr1", "Radarr2"]
+    deleterr.process_sonarr_instance.assert_called_once_with(
+        "Sonarr1",
+        deleterr.sonarr["Sonarr1"],
+        [{"name": "TV Shows", "sonarr": "Sonarr1"}],
+    )
+
+
+@patch("app.deleterr.MediaCleaner", return_value=MagicMock())
+@patch("app.deleterr.SonarrAPI")
+def test_init_does_not_process_instances(sonarr_mock, media_cleaner_mock):
+    config = MagicMock()
+    config.settings = {
+        "sonarr": [{"name": "Sonarr1", "url": "http://sonarr", "api_key": "KEY"}]
+    }
+
+    Deleterr(config)
+
+    sonarr_mock.return_value.get_series.assert_not_called()
+
+
+@patch("app.deleterr.MediaCleaner", return_value=MagicMock())
+def test_arr_clients_share_one_session(media_cleaner_mock):
+    config = MagicMock()
+    config.settings = {
+        "sonarr": [{"name": "Sonarr1", "url": "http://sonarr", "api_key": "KEY"}],
+        "radarr": [{"name": "Radarr1", "url": "http://radarr", "api_key": "KEY"}],
+    }
+
+    deleterr = Deleterr(config)
+
+    assert deleterr.sonarr["Sonarr1"].session is deleterr.session
+    assert deleterr.radarr["Radarr1"].session is deleterr.session
+
+
+@patch("app.deleterr.MediaCleaner", return_value=MagicMock())
+@patch("app.deleterr.SonarrAPI")
+def test_empty_sonarr_section_builds_no_clients(sonarr_mock, media_cleaner_mock):
+    config = MagicMock()
+    config.settings = {"sonarr": None, "libraries": [{"sonarr": "Sonarr1"}]}
+
+    deleterr = Deleterr(config)
+    deleterr.process_sonarr()
+
+    assert deleterr.sonarr == {}
+    sonarr_mock.assert_not_called()
+
+
+def test_get_file_contents_strips_whitespace(tmp_path):
+    file_path = tmp_path / "commit_tag.txt"
+    file_path.write_text("abc123\n")
+
+    assert get_file_contents(file_path) == "abc123"
+
+
+@patch("app.deleterr.logger")
+def test_get_file_contents_missing_file(logger_mock, tmp_path):
+    assert get_file_contents(tmp_path / "missing.txt") is None
+    logger_mock.warning.assert_called_once()
+
+
+def test_process_sonarr_instance_without_libraries_skips_fetch(deleterr):
+    sonarr = MagicMock()
+
+    deleterr.process_sonarr_instance("Sonarr1", sonarr, [])
+
+    sonarr.get_series.assert_not_called()
+
+
+@patch("app.deleterr.locale.setlocale")
+def test_init_locale_is_opt_in(setlocale_mock, monkeypatch):
+    init_locale.cache_clear()
+    monkeypatch.delenv("DELETERR_USE_LOCALE", raising=False)
+    init_locale()
+    setlocale_mock.assert_not_called()
+
+    init_locale.cache_clear()
+    monkeypatch.setenv("DELETERR_USE_LOCALE", "1")
+    init_locale()
+    setlocale_mock.assert_called_once()
+    init_locale.cache_clear()
@@ -10,6 +10,7 @@ from app.config import Config
 from app.media_cleaner import (
     DEFAULT_MAX_ACTIONS_PER_RUN,
     MediaCleaner,
+    PlexLibraryIndex,
     find_watched_data,
     library_meets_disk_space_threshold,
 )
@@ -70,6 +71,18 @@ class TestLibraryMeetsDiskSpaceThreshold(unittest.TestCase):
     def test_unset_disk_size_threshold(self):
         del self.library["disk_size_threshold"]
         self.assertTrue(library_meets_disk_space_threshold(self.library, self.pyarr))
+        self.pyarr.get_disk_space.assert_not_called()
+
+    def test_multiple_thresholds_fetch_disk_space_once(self):
+        self.library["disk_size_threshold"].append(
+            {"path": "/data/media/other", "threshold": "1TB"}
+        )
+        self.pyarr.get_disk_space.return_value = [
+            {"path": "/data/media/local", "freeSpace": 500000000000},
+            {"path": "/data/media/other", "freeSpace": 500000000000},
+        ]
+        self.assertTrue(library_meets_disk_space_threshold(self.library, self.pyarr))
+        self.pyarr.get_disk_space.assert_called_once()
 
 
 class TestFindWatchedData(unittest.TestCase):
@@ -528,7 +541,9 @@ def test_check_excluded_titles(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} has excluded title {exclude['titles'][0]}, skipping"
+        "%s has excluded title %s, skipping",
+        media_data["title"],
+        exclude["titles"][0],
     )
     assert result is False
 
@@ -549,7 +564,7 @@ def test_check_excluded_genres(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} has excluded genre {exclude['genres'][0]}, skipping"
+        "%s has excluded genre %s, skipping", media_data["title"], exclude["genres"][0]
     )
     assert result is False
 
@@ -570,7 +585,9 @@ def test_check_excluded_collections(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} has excluded collection {exclude['collections'][0]}, skipping"
+        "%s has excluded collection %s, skipping",
+        media_data["title"],
+        exclude["collections"][0],
     )
     assert result is False
 
@@ -591,7 +608,9 @@ def test_check_excluded_labels(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} has excluded label {exclude['plex_labels'][0]}, skipping"
+        "%s has excluded label %s, skipping",
+        media_data["title"],
+        exclude["plex_labels"][0],
     )
     assert result is False
 
@@ -612,7 +631,12 @@ def test_check_excluded_release_years(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} ({plex_media_item.year}) was released within the threshold years ({datetime.now().year} - {exclude.get('release_years', 0)} = {datetime.now().year - exclude.get('release_years', 0)}), skipping"
+        "%s (%s) was released within the threshold years (%s - %s = %s), skipping",
+        media_data["title"],
+        plex_media_item.year,
+        datetime.now().year,
+        exclude["release_years"],
+        datetime.now().year - exclude["release_years"],
     )
     assert result is False
 
@@ -633,7 +657,9 @@ def test_check_excluded_studios(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} has excluded studio {plex_media_item.studio}, skipping"
+        "%s has excluded studio %s, skipping",
+        media_data["title"],
+        plex_media_item.studio,
     )
     assert result is False
 
@@ -654,7 +680,10 @@ def test_check_excluded_producers(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} [{plex_media_item}] has excluded producer {exclude['producers'][0]}, skipping"
+        "%s [%s] has excluded producer %s, skipping",
+        media_data["title"],
+        plex_media_item,
+        exclude["producers"][0],
     )
     assert result is False
 
@@ -675,7 +704,10 @@ def test_check_excluded_directors(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} [{plex_media_item}] has excluded director {exclude['directors'][0]}, skipping"
+        "%s [%s] has excluded director %s, skipping",
+        media_data["title"],
+        plex_media_item,
+        exclude["directors"][0],
     )
     assert result is False
 
@@ -696,7 +728,10 @@ def test_check_excluded_writers(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} [{plex_media_item}] has excluded writer {exclude['writers'][0]}, skipping"
+        "%s [%s] has excluded writer %s, skipping",
+        media_data["title"],
+        plex_media_item,
+        exclude["writers"][0],
     )
     assert result is False
 
@@ -717,7 +752,10 @@ def test_check_excluded_actors(mocker):
 
     # Assert
     mock_logger.debug.assert_called_once_with(
-        f"{media_data['title']} [{plex_media_item}] has excluded actor {exclude['actors'][0]}, skipping"
+        "%s [%s] has excluded actor %s, skipping",
+        media_data["title"],
+        plex_media_item,
+        exclude["actors"][0],
     )
     assert result is False
 
@@ -1038,6 +1076,29 @@ def test_delete_series_no_errors(standard_config):
     mock_sonarr.del_series.assert_called_once_with(sonarr_show["id"], delete_files=True)
 
 
+def test_delete_series_deletes_shared_episode_files_once(standard_config):
+    # Arrange
+    mock_sonarr = MagicMock()
+    sonarr_show = {"id": 1, "title": "Test Show"}
+    episodes = [
+        {"id": 1, "episodeFileId": 1},
+        {"id": 2, "episodeFileId": 1},
+        {"id": 3, "episodeFileId": 0},
+        {"id": 4, "episodeFileId": 2},
+    ]
+
+    mock_sonarr.get_episode.return_value = episodes
+
+    media_cleaner_instance = MediaCleaner(standard_config)
+
+    # Act
+    media_cleaner_instance.delete_series(mock_sonarr, sonarr_show)
+
+    # Assert
+    assert [c.args for c in mock_sonarr.del_episode_file.call_args_list] == [(1,), (2,)]
+    mock_sonarr.del_series.assert_called_once_with(sonarr_show["id"], delete_files=True)
+
+
 @patch("builtins.input", return_value="y")
 def test_delete_movie_if_allowed_interactive_yes(mock_input, standard_config):
     # Arrange
@@ -1242,10 +1303,13 @@ def test_get_plex_item_not_found(standard_config):
 
 def test_find_by_guid_found(standard_config):
     # Arrange
-    plex_library = [
-        (["test-guid-1", "test-guid-2"], "plex_media_item_1"),
-        (["test-guid-3", "test-guid-4"], "plex_media_item_2"),
-    ]
+    plex_media_item_1 = MagicMock(title="Title 1")
+    plex_library = PlexLibraryIndex(
+        [
+            (["test-guid-1", "test-guid-2"], plex_media_item_1),
+            (["test-guid-3", "test-guid-4"], MagicMock(title="Title 2")),
+        ]
+    )
     guid = "test-guid-1"
 
     media_cleaner_instance = MediaCleaner(standard_config)
@@ -1254,15 +1318,33 @@ def test_find_by_guid_found(standard_config):
     result = media_cleaner_instance.find_by_guid(plex_library, guid)
 
     # Assert
-    assert result == "plex_media_item_1"
+    assert result is plex_media_item_1
+
+
+def test_find_by_guid_partial_guid(standard_config):
+    # Arrange
+    plex_media_item = MagicMock(title="Title")
+    plex_library = PlexLibraryIndex(
+        [(["com.plexapp.agents.imdb://tt1234?lang=en"], plex_media_item)]
+    )
+
+    media_cleaner_instance = MediaCleaner(standard_config)
+
+    # Act
+    result = media_cleaner_instance.find_by_guid(plex_library, "imdb://tt1234")
+
+    # Assert
+    assert result is plex_media_item
 
 
 def test_find_by_guid_not_found(standard_config):
     # Arrange
-    plex_library = [
-        (["test-guid-1", "test-guid-2"], "plex_media_item_1"),
-        (["test-guid-3", "test-guid-4"], "plex_media_item_2"),
-    ]
+    plex_library = PlexLibraryIndex(
+        [
+            (["test-guid-1", "test-guid-2"], MagicMock(title="Title 1")),
+            (["test-guid-3", "test-guid-4"], MagicMock(title="Title 2")),
+        ]
+    )
     guid = "nonexistent-guid"
 
     media_cleaner_instance = MediaCleaner(standard_config)
@@ -1365,7 +1447,9 @@ def test_find_by_title_and_year(
     expected,
 ):
     # Arrange
-    plex_library = [(None, MagicMock(title=plex_title)) for plex_title in plex_titles]
+    plex_library = PlexLibraryIndex(
+        (None, MagicMock(title=plex_title)) for plex_title in plex_titles
+    )
 
     media_cleaner_instance = MediaCleaner(standard_config)
 
@@ -1381,6 +1465,25 @@ def test_find_by_title_and_year(
         assert result.title in [title] + alternate_titles
 
 
+def test_find_by_title_and_year_returns_first_item_in_library_order(
+    standard_config,
+):
+    # Arrange
+    alternate = MagicMock(title="Alternate Title", year=2022)
+    exact = MagicMock(title="Test Title", year=2022)
+    plex_library = PlexLibraryIndex([(None, alternate), (None, exact)])
+
+    media_cleaner_instance = MediaCleaner(standard_config)
+
+    # Act
+    result = media_cleaner_instance.find_by_title_and_year(
+        plex_library, "Test Title", 2022, ["Alternate Title"]
+    )
+
+    # Assert
+    assert result is alternate
+
+
 @pytest.mark.parametrize(
     "plex_guids, tvdb_id, expected",
     [
@@ -1,6 +1,11 @@
 import pytest
 
-from app.utils import parse_size_to_bytes, print_readable_freed_space, validate_units
+from app.utils import (
+    create_session,
+    parse_size_to_bytes,
+    print_readable_freed_space,
+    validate_units,
+)
 
 
 @pytest.mark.parametrize(
@@ -42,6 +47,11 @@ def test_parse_size_to_bytes(input_size, expected_output):
     ), f"For {input_size}, expected {expected_output} but got {result}"
 
 
+def test_parse_size_to_bytes_invalid_unit():
+    with pytest.raises(ValueError):
+        parse_size_to_bytes("10T")
+
+
 def test_validate_units_invalid():
     with pytest.raises(ValueError):
         validate_units("10T")
@@ -64,3 +74,12 @@ def test_validate_units_valid(input_string):
         validate_units(input_string)
     except ValueError:
         pytest.fail("Unexpected ValueError ..")
+
+
+def test_create_session_only_retries_reads():
+    session = create_session()
+
+    retry = session.get_adapter("https://example.com").max_retries
+    assert retry.is_retry("GET", 504)
+    assert not retry.is_retry("DELETE", 504)
+    assert not retry.is_retry("POST", 504)